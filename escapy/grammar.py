@@ -18,6 +18,7 @@
 # Standard imports
 from logging import DEBUG
 from itertools import islice
+import struct
 
 # Custom imports
 from lark import Lark, Token, UnexpectedToken
@@ -28,12 +29,25 @@ from escapy.commons import logger
 
 LOGGER = logger()
 
+# Lengths encoded by the TIFF/RLE counters, indexed by the counter byte:
+# - repeat counters (negative values in two's complement): 256 - counter + 1
+# - data-length counters (positive values): counter + 1
+RLE_LENGTHS = bytes(257 - c if c & 0x80 else c + 1 for c in range(256))
+
+# Decoders of the headers of commands followed by a variable number of bytes;
+# counts are little-endian 16-bit integers (nL + nH × 256).
+COUNT_HEADER = struct.Struct("<H")  # nL, nH
+BIT_IMAGE_HEADER = struct.Struct("<BH")  # m, nL, nH
+RASTER_GRAPHICS_HEADER = struct.Struct("<4BH")  # mode, v, h, m, nL, nH
+BARCODE_HEADER = struct.Struct("<H3BHB")  # nL, nH, k, m, s, v1, v2, c
+
 esc_grammar = r"""
     start: instruction+
 
-    instruction:  tiff_compressed_rule
+    # Inlined: commands are direct children of start (no wrapper tree)
+    ?instruction:  tiff_compressed_rule
         | ANYTHING               -> binary_blob
-        | TRASH
+        | _TRASH
         | INIT                   -> reset_printer
 
         # Useless: do not implement
@@ -234,7 +248,8 @@ esc_grammar = r"""
     # Used for extra codes that can be inserted without any meaning, not printable,
     # or without belonging to a command (NUL bytes for example).
     # PS: see the lowest priority assigned
-    TRASH.-2: /[\x00-\xff]/
+    # PS2: Filtered out of the parse tree (no command to run)
+    _TRASH.-2: /[\x00-\xff]/
 
     # For user defined characters handling in ESCP2 mode, we need to check
     # the scripting status with the help of these tokens.
@@ -340,27 +355,41 @@ def decompress_rle_data(
     :type iter_data: Iterator[bytearray]
     :type expected_decompressed_bytes: int
     :return: Tuple of decompressed data, and number of bytes read.
+        Decompressed data is truncated to the expected number of bytes.
     """
-    decompressed_data = bytearray()
+    # The output size is known: write into a preallocated buffer instead of
+    # growing it block after block. Zeroed repeated blocks are already there.
+    decompressed_data = bytearray(expected_decompressed_bytes)
+    view = memoryview(decompressed_data)
+    pos = 0
     bytes_read = 0
     for counter in iter_data:
+        length = RLE_LENGTHS[counter]
+        end = min(pos + length, expected_decompressed_bytes)
         if counter & 0x80:
             # Repeat counters: number of times to repeat data
-            repeat = 256 - counter + 1
-            decompressed_data += (next(iter_data)).to_bytes(1) * repeat
+            value = next(iter_data)
+            if value:
+                view[pos:end] = value.to_bytes(1) * (end - pos)
             bytes_read += 1
         else:
             # Data-length counters: number of data bytes to follow
-            block_length = counter + 1
-            decompressed_data += bytearray(islice(iter_data, block_length))
-            bytes_read += block_length
+            block = bytes(islice(iter_data, length))
+            end = min(pos + len(block), expected_decompressed_bytes)
+            view[pos:end] = block[:end - pos]
+            bytes_read += length
 
         bytes_read += 1
+        pos = end
 
-        if len(decompressed_data) >= expected_decompressed_bytes:
+        if pos >= expected_decompressed_bytes:
             # We have all the data we needed
             break
 
+    view.release()
+    if pos < expected_decompressed_bytes:
+        # Truncated stream
+        del decompressed_data[pos:]
     return decompressed_data, bytes_read
 
 
@@ -380,6 +409,8 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
     :rtype: lark.tree.Tree
     """
     interactive = parser.parse_interactive(code, start)
+    # Avoid debug calls for each command with data if they are not displayed
+    debug = LOGGER.level == DEBUG
     data_token_flag = False  # Used to trigger DATA token build
     expected_bytes = 0
     scripting_status = None
@@ -398,8 +429,7 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
             # print(token.type, token.value)
 
             if token.type in ("SELECT_BIT_IMAGE_HEADER", "SELECT_BIT_IMAGE_9PINS_HEADER"):
-                dot_density_m, nL, nH = token.value
-                dot_columns_nb = (nH << 8) + nL
+                dot_density_m, dot_columns_nb = BIT_IMAGE_HEADER.unpack(token.value)
 
                 if dot_density_m < 32:
                     bytes_per_column = 1
@@ -410,42 +440,46 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
 
                 expected_bytes = bytes_per_column * dot_columns_nb
 
-                LOGGER.debug(
-                    "Expect %d bytes (%d dots per column)",
-                    expected_bytes,
-                    8 * bytes_per_column,
-                )
+                if debug:
+                    LOGGER.debug(
+                        "Expect %d bytes (%d dots per column)",
+                        expected_bytes,
+                        8 * bytes_per_column,
+                    )
                 data_token_flag = True
 
             if token.type in ("PRINT_DATA_AS_CHARACTERS_HEADER", "SELECT_XDPI_GRAPHICS_HEADER"):
-                nL, nH = token.value
-                expected_bytes = (nH << 8) + nL
+                (expected_bytes,) = COUNT_HEADER.unpack(token.value)
                 data_token_flag = True
 
             elif token.type == "PRINT_RASTER_GRAPHICS_HEADER":
                 # b"\x01\x14\x14\x18\xa0\x01"
-                graphics_mode, v_res, h_res, v_dot_count_m, nL, nH = token.value
-                h_dot_count = (nH << 8) + nL
+                graphics_mode, v_res, h_res, v_dot_count_m, h_dot_count = (
+                    RASTER_GRAPHICS_HEADER.unpack(token.value)
+                )
                 expected_decompressed_bytes = v_dot_count_m * int((h_dot_count + 7) / 8)
                 # print(f"Expect {expected_decompressed_bytes} bytes")
                 if graphics_mode == 1:
                     # RLE/TIFF compression
-                    token_start_pos = interactive.lexer_thread.state.line_ctr.char_pos
-                    iter_data = iter(interactive.lexer_thread.state.text[token_start_pos:])
+                    lexer_state = interactive.lexer_thread.state
+                    token_start_pos = lexer_state.line_ctr.char_pos
+                    # Do not copy the remaining code: iterate on a view
+                    iter_data = iter(memoryview(lexer_state.text)[token_start_pos:])
                     data, expected_bytes = decompress_rle_data(iter_data, expected_decompressed_bytes)
                     # print(data, "ret expected", expected_bytes, "curr", len(data))
                 else:
                     # No compression
                     expected_bytes = expected_decompressed_bytes
 
-                LOGGER.debug("Expect %d bytes", expected_bytes)
+                if debug:
+                    LOGGER.debug("Expect %d bytes", expected_bytes)
                 data_token_flag = True
 
             elif token.type == "BARCODE_HEADER":
-                nL, nH, *_ = token.value
-                expected_bytes = (nH << 8) + nL - 6
+                expected_bytes = COUNT_HEADER.unpack_from(token.value)[0] - 6
 
-                LOGGER.debug("Expect %d bytes", expected_bytes)
+                if debug:
+                    LOGGER.debug("Expect %d bytes", expected_bytes)
                 data_token_flag = True
 
             elif token.type == "XFER_HEADER":
@@ -468,19 +502,21 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
                     # F = 1 then #BC = number of next bytes to read
                     # #BC = 2: number of raster data = n1 + n2 × 256
                     # Get the next bytes as nL and nH
-                    nL = lexer_state.text[token_start_pos]
-                    nH = lexer_state.text[token_start_pos + 1]
-                    expected_decompressed_bytes = (nH << 8) + nL
+                    expected_decompressed_bytes = int.from_bytes(
+                        lexer_state.text[token_start_pos:token_start_pos + 2], "little"
+                    )
 
                     token_start_pos += 2
                 else:  # pragma: no cover
                     raise ValueError("<XFER> F or BC (nibble) value not expected!")
 
-                LOGGER.debug("Expect %d decompressed bytes", expected_decompressed_bytes)
+                if debug:
+                    LOGGER.debug("Expect %d decompressed bytes", expected_decompressed_bytes)
                 data_token_flag = True
 
                 lexer_state.line_ctr.char_pos = token_start_pos
-                iter_data = iter(lexer_state.text[token_start_pos:])
+                # Do not copy the remaining code: iterate on a view
+                iter_data = iter(memoryview(lexer_state.text)[token_start_pos:])
                 data, expected_bytes = decompress_rle_data(iter_data, expected_decompressed_bytes)
 
                 # print(lexer_state.text[token_start_pos:])
@@ -491,7 +527,6 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
             elif token.type == "MOVY_HEADER":
                 lexer_state = interactive.lexer_thread.state
                 token_start_pos = lexer_state.line_ctr.char_pos
-                iter_data = iter(lexer_state.text[token_start_pos:])
 
                 cmd = token.value[0]
                 cmd_bc = cmd & 0x0f
@@ -501,14 +536,14 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
                 elif cmd_bc == 1:
                     # F = 1 then
                     # #BC = 1: nL = interval of values 16-255
-                    nL = next(iter_data)
-                    dot_offset = nL
+                    dot_offset = lexer_state.text[token_start_pos]
                     lexer_state.line_ctr.char_pos += 1
                 elif cmd_bc == 2:
                     # F = 1 then
                     # #BC = 2: interval of values = nL + nH × 256
-                    nL, nH = next(iter_data), next(iter_data)
-                    dot_offset = (nH << 8) + nL
+                    dot_offset = int.from_bytes(
+                        lexer_state.text[token_start_pos:token_start_pos + 2], "little"
+                    )
                     lexer_state.line_ctr.char_pos += 2
                 else:  # pragma: no cover
                     raise ValueError("<MOVY> F or BC (nibble) value not expected!")
@@ -523,7 +558,6 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
             elif token.type == "MOVX_HEADER":
                 lexer_state = interactive.lexer_thread.state
                 token_start_pos = lexer_state.line_ctr.char_pos
-                iter_data = iter(lexer_state.text[token_start_pos:])
 
                 cmd = token.value[0]
                 # Here we get signed values
@@ -534,16 +568,20 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
                 elif cmd_bc == 1:
                     # F = 1 then #BC = 1: number of next bytes to read
                     # nL (–128 ~ 127)
-                    nL = next(iter_data)
-                    dot_offset = nL - 2**8 if nL & 0x80 else nL
+                    dot_offset = int.from_bytes(
+                        lexer_state.text[token_start_pos:token_start_pos + 1],
+                        "little",
+                        signed=True,
+                    )
                     lexer_state.line_ctr.char_pos += 1
                 elif cmd_bc == 2:
                     # F = 1 then #BC = 2: number of next bytes to read
                     # nL, nH (–32768 ~ 32767)
-                    nL, nH = next(iter_data), next(iter_data)
-                    dot_offset = (nH << 8) + nL
-                    if dot_offset & 0x8000:
-                        dot_offset -= 2**16
+                    dot_offset = int.from_bytes(
+                        lexer_state.text[token_start_pos:token_start_pos + 2],
+                        "little",
+                        signed=True,
+                    )
                     lexer_state.line_ctr.char_pos += 2
                 else:  # pragma: no cover
                     raise ValueError("<MOVX> F or BC (nibble) value not expected!")
@@ -588,7 +626,8 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
                 # LOGGER.debug("Total expect %d bytes", expected_bytes)
 
                 expected_bytes = 0
-                iter_data = iter(lexer_state.text[token_start_pos:])
+                # Do not copy the remaining code: iterate on a view
+                iter_data = iter(memoryview(lexer_state.text)[token_start_pos:])
                 while expected_char_nb:
                     interactive.feed_token(token)
                     space_left_a0, char_width_a1, space_right_a2 = islice(iter_data, 0, 3)
@@ -604,7 +643,8 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
                         "DATA",
                         ((space_left_a0, char_width_a1, space_right_a2), char_data),
                     )
-                    LOGGER.debug("Expect %d bytes", char_expected_bytes)
+                    if debug:
+                        LOGGER.debug("Expect %d bytes", char_expected_bytes)
                 lexer_state.line_ctr.char_pos += expected_bytes
 
             elif token.type in ("_SCRIPT", "_UNSCRIPT"):
@@ -642,7 +682,7 @@ def parse_from_stream(parser, code, *args, start=None, **kwargs):
             interactive.feed_token(token)
 
     tree = interactive.resume_parse()
-    if LOGGER.level == DEBUG:
+    if debug:
         LOGGER.debug("\n%s", tree.pretty())
     return tree
 
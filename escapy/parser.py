@@ -20,9 +20,11 @@ import importlib
 from pathlib import Path
 from enum import Enum
 import itertools as it
+from bisect import bisect_right
 import codecs
 from functools import lru_cache, partial
 from hashlib import md5
+from types import FunctionType
 from logging import DEBUG
 
 # Custom imports
@@ -30,6 +32,7 @@ import numpy as np
 from PIL import Image
 from lark import Token
 from reportlab.lib import colors
+from reportlab.graphics.barcode import createBarcodeDrawing
 from reportlab.lib.colors import PCMYKColorSep
 from reportlab.pdfgen.canvas import Canvas
 from reportlab.lib.pagesizes import A4
@@ -38,7 +41,14 @@ from reportlab.pdfbase.ttfonts import TTFont
 
 # Local imports
 from escapy import __version__
-from escapy.grammar import init_parser
+from escapy.grammar import (
+    init_parser,
+    RLE_LENGTHS,
+    COUNT_HEADER,
+    BIT_IMAGE_HEADER,
+    RASTER_GRAPHICS_HEADER,
+    BARCODE_HEADER,
+)
 from escapy.commons import (
     TYPEFACE_NAMES,
     CHARSET_NAMES_MAPPING,
@@ -102,6 +112,69 @@ class PrintControlCodes(Enum):
 
 
 LOGGER = logger()
+# Map character style ids with reportlab text render modes; See ESC q
+CHARACTER_STYLE_MAPPING = {
+    0: None,
+    1: PrintCharacterStyle.OUTLINE,
+    2: PrintCharacterStyle.FILL,
+    3: PrintCharacterStyle.SHADOW,
+}
+# Debug names of the ESC q and ESC ( - settings
+CHARACTER_STYLE_NAMES = {
+    0: "Turn off outline/shadow printing",
+    1: "Turn on outline printing",
+    2: "Turn on shadow printing",
+    3: "Turn on outline and shadow printing",
+}
+SCORING_TYPE_NAMES = {
+    1: "Underline",  # below
+    2: "Strikethrough",  # middle
+    3: "Overscore",  # above
+}
+SCORING_STYLE_NAMES = {
+    0: "Turn off scoring",
+    1: "Single continuous line",
+    2: "Double continuous line",
+    5: "Single broken line",
+    6: "Double broken line",
+}
+# Characters used to draw the ESC ( - scoring styles; See apply_text_scoring()
+SCORING_CHARACTERS = {
+    1: "—",
+    2: "=",  # "＝", FULLWIDTH EQUALS SIGN, not available on various fonts
+    5: "-",
+    6: "=",
+}
+# Bit image commands, indexed in the densities reassigned by ESC ?
+KLYZ_COMMAND_INDEXES = {
+    b"K": 0,
+    b"L": 1,
+    b"Y": 2,
+    b"Z": 3,
+}
+# Reportlab barcode names of the ESC ( B bar code types
+BARCODE_TYPES = {
+    0: "EAN13",
+    1: "EAN8",
+    2: "I2of5",  # "Interleaved 2 of 5",
+    3: "UPCA",
+    4: "UPCE",  # Not supported
+    5: "Standard39",
+    6: "Code128",
+    7: "POSTNET",
+}
+# Default printable area margins (top, bottom, left, right) in inches
+SINGLE_SHEET_MARGINS_INCH = tuple(mm / 25.4 for mm in (6.35, 6.35, 6.35, 6.35))
+CONTINUOUS_PAPER_MARGINS_INCH = tuple(mm / 25.4 for mm in (9, 9, 3, 3))
+# Character pitches switched by the condensed mode (fixed spacing only)
+CONDENSED_PITCHES = {1 / 10: 1 / 17.14, 1 / 12: 1 / 20}
+UNCONDENSED_PITCHES = {
+    condensed: normal for normal, condensed in CONDENSED_PITCHES.items()
+}
+# Italic table: characters of the upper part are mapped to the lower part
+ITALIC_TO_ROMAN = bytes(byte & 0x7F for byte in range(256))
+# Bit-reversed bytes: the leftmost dot of a raster byte becomes its LSB
+REVERSED_BYTES = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
 
 
 class ESCParser:
@@ -113,7 +186,156 @@ class ESCParser:
     - ESC/P2
     """
 
+    # Attributes are written by almost every command: skip the instance dict
+    __slots__ = (
+        # Misc
+        "commands",
+        "mode",
+        "previous_mode",
+        "set_font_lock",
+        "pins",
+        "dots_as_circles",
+        "current_pdf",
+        "automatic_linefeed",
+        # Character enhancements
+        "baseline_offset",
+        "italic",
+        "bold",
+        "_underline",
+        "underline_start",
+        "scoring_types",
+        "scripting",
+        "previous_scripting",
+        "character_style",
+        "_condensed",
+        "previous_condensed",
+        "condensed_fallback",
+        "condensed_autoscaling",
+        "double_strike",
+        "_double_width",
+        "_double_width_multi",
+        "double_height",
+        "_color",
+        # Font rendering
+        "multipoint_mode",
+        "_point_size",
+        "_character_pitch",
+        "character_width",
+        "_proportional_spacing",
+        "_effective_character_pitch",
+        "extra_intercharacter_space",
+        "horizontal_tabulations",
+        "vertical_tabulations",
+        "defined_unit",
+        "unit_360",
+        "absolute_horizontal_unit",
+        "current_line_spacing",
+        # Page configuration
+        "page_width",
+        "page_height",
+        "single_sheet_paper",
+        "printable_area",
+        "top_margin",
+        "bottom_margin",
+        "left_margin",
+        "right_margin",
+        "printable_area_width",
+        "page_length",
+        # Character tables & fonts
+        "character_tables",
+        "typefaces",
+        "current_fontpath",
+        "character_table",
+        "international_charset",
+        "typeface",
+        "copied_font",
+        "ram_characters",
+        "userdef_db_filepath",
+        "userdef_images_path",
+        "user_defined",
+        "control_codes_filter",
+        "_decoders",
+        "_encoding_variants",
+        # Graphics
+        "graphics_mode",
+        "microweave_mode",
+        "bit_image_modes",
+        "vertical_resolution",
+        "horizontal_resolution",
+        "double_speed",
+        "klyz_densities",
+        "bytes_per_line",
+        "bytes_per_column",
+        "movx_unit",
+        # Cursors
+        "cursor_x",
+        "cursor_y",
+    )
+
+    # Colors indexed by color ids; See color & barcode()
+    # Shared by all instances: reportlab colors are built once at import.
+    color_names = (
+        "Black",
+        "Magenta",
+        "Cyan",
+        "Violet",
+        "Yellow",
+        "Red",
+        "Green",
+    )
+    RGB_colors = tuple(
+        colors.HexColor(hex_color)
+        for hex_color in (
+            "#000000",  # Black
+            "#ff00ff",  # Magenta
+            "#00ffff",  # Cyan
+            "#8F00FF",  # Violet
+            "#ffff00",  # Yellow
+            "#ff0000",  # Red
+            "#00ff00",  # Green
+        )
+    )
+    CMYK_colors = (
+        PCMYKColorSep(0, 0, 0, 100),  # Black
+        PCMYKColorSep(0, 100, 0, 0),  # Magenta
+        PCMYKColorSep(100, 0, 0, 0),  # Cyan
+        PCMYKColorSep(44, 100, 0, 0, spotName="VIOLET"),
+        PCMYKColorSep(0, 0, 100, 0),  # Yellow
+        PCMYKColorSep(0, 100, 100, 0, spotName="RED"),
+        PCMYKColorSep(100, 0, 100, 0, spotName="GREEN"),
+    )
+
+    # Get horizontal density with dot density value; See bit_image_modes
+    bit_image_horizontal_resolution_mapping = {
+        0: 1 / 60,
+        1: 1 / 120,
+        2: 1 / 120,
+        3: 1 / 240,
+        4: 1 / 80,
+        5: 1 / 72,
+        6: 1 / 90,
+        7: 1 / 144,
+        32: 1 / 60,
+        33: 1 / 120,
+        38: 1 / 90,
+        39: 1 / 180,
+        40: 1 / 360,
+        64: 1 / 60,
+        65: 1 / 120,
+        70: 1 / 90,
+        71: 1 / 180,
+        72: 1 / 360,
+        73: 1 / 360,
+    }
+
     default_typeface = 0  # Roman
+    # Default table of (pre)loaded encodings; See character_tables
+    default_character_tables = (
+        "italic",
+        "cp437",
+        None,  # User-defined characters: can be reassigned but lost until reset
+        "cp437",
+    )
 
     def __init__(
         self,
@@ -172,8 +394,18 @@ class ESCParser:
         :type output_file: io.TextIOWrapper | str | Path
         """
         # Misc #################################################################
-        # Prepare for methods search in run_esc_instruction()
-        self.dir = frozenset(dir(self))
+        # Prepare for methods search in run_esc_instruction():
+        # Methods indexed by their names (aliases used in the grammar).
+        # PS: Functions are not bound to avoid a reference cycle that would
+        # delay the deletion of the object (see RAMCharacters.__del__).
+        # PS2: The whole MRO is walked so that subclasses inherit the commands;
+        # methods of subclasses override the ones of their parents.
+        self.commands = {
+            name: method
+            for cls in reversed(type(self).__mro__)
+            for name, method in vars(cls).items()
+            if not name.startswith("_") and isinstance(method, FunctionType)
+        }
 
         self.mode: PrintMode = PrintMode.LQ
         # Used to postpone or suspend the print mode
@@ -187,10 +419,8 @@ class ESCParser:
         self.dots_as_circles = dots_as_circles
         self.current_pdf = None
 
-        if automatic_linefeed:
-            # CR will be accompanied by LF;
-            # LF will call _carriage_return() internally.
-            self.carriage_return = self.line_feed
+        # CR will be accompanied by LF; See carriage_return()
+        self.automatic_linefeed = automatic_linefeed
 
         # Character enhancements ###############################################
         self.baseline_offset = 7 / 72 if self.pins == 9 else 20 / 180
@@ -214,34 +444,6 @@ class ESCParser:
         self.double_height = False
         self._color = 0  # Black
 
-        self.color_names = [
-            "Black",
-            "Magenta",
-            "Cyan",
-            "Violet",
-            "Yellow",
-            "Red",
-            "Green",
-        ]
-        self.RGB_colors = [
-            "#000000",  # Black
-            "#ff00ff",  # Magenta
-            "#00ffff",  # Cyan
-            "#8F00FF",  # Violet
-            "#ffff00",  # Yellow
-            "#ff0000",  # Red
-            "#00ff00",  # Green
-        ]
-        self.CMYK_colors = [
-            PCMYKColorSep(0, 0, 0, 100),  # Black
-            PCMYKColorSep(0, 100, 0, 0),  # Magenta
-            PCMYKColorSep(100, 0, 0, 0),  # Cyan
-            PCMYKColorSep(44, 100, 0, 0, spotName="VIOLET"),
-            PCMYKColorSep(0, 0, 100, 0),  # Yellow
-            PCMYKColorSep(0, 100, 100, 0, spotName="RED"),
-            PCMYKColorSep(100, 0, 100, 0, spotName="GREEN"),
-        ]
-
         # Font rendering #######################################################
         # Scalable fonts status
         self.multipoint_mode = False
@@ -251,6 +453,8 @@ class ESCParser:
         self.character_width = None  # HMI, horizontal motion index
         # Fixed character spacing
         self._proportional_spacing = False
+        # Pitch used by margins & tabs; See _update_effective_character_pitch()
+        self._effective_character_pitch = 1 / 10
         # Extra space set by ESC SP
         self.extra_intercharacter_space = 0
         # Init tabulations
@@ -259,6 +463,11 @@ class ESCParser:
         self.vertical_tabulations = None
         # Must be None because functions where it is used have their own default values
         self.defined_unit = None
+        # Units resolved from defined_unit; updated by set_unit()
+        # Default 1/360 inch: ESC ( V, ESC ( v, ESC ( C, ESC ( c, MOVX, MOVY
+        self.unit_360 = 1 / 360
+        # ESC $: 1/60 inch by default, always on 9 pins printers
+        self.absolute_horizontal_unit = 1 / 60
         self.current_line_spacing = 1 / 6
 
         if pdf:
@@ -284,16 +493,20 @@ class ESCParser:
         self.single_sheet_paper = single_sheets
 
         # Default printable area (restricted with margins into the printing area)
-        if not printable_area_margins_mm:
+        if printable_area_margins_mm:
+            # Convert printable area from mm to inches
+            printable_area_margins_inch = tuple(
+                i / 25.4 for i in printable_area_margins_mm
+            )
+        else:
             # Todo: be sure about margins for continuous paper: None ? cf p18
             #   "Either no margin or 1-inch margin" (doc ESC N) but its for
             #   printing margins not printable margins...
-            printable_area_margins_mm = (
-                (6.35, 6.35, 6.35, 6.35) if self.single_sheet_paper else (9, 9, 3, 3)
+            printable_area_margins_inch = (
+                SINGLE_SHEET_MARGINS_INCH
+                if self.single_sheet_paper
+                else CONTINUOUS_PAPER_MARGINS_INCH
             )
-
-        # Convert printable area from mm to inches
-        printable_area_margins_inch = tuple(i / 25.4 for i in printable_area_margins_mm)
         # Convert printable area to absolute positions
         top, bottom, left, right = printable_area_margins_inch
         self.printable_area = (
@@ -340,13 +553,13 @@ class ESCParser:
 
         LOGGER.debug("constructed page length: %s", self.page_length)
 
-        # Table of (pre)loaded encodings
-        self.character_tables = [
-            "italic",
-            "cp437",
-            None,  # User-defined characters: can be reassigned but lost until reset
-            "cp437",
-        ]
+        # Table of (pre)loaded encodings; reassigned by ESC ( t
+        self.character_tables = list(self.default_character_tables)
+        # Decode functions of the codecs already used, by encoding name
+        self._decoders = {}
+        # Encoding names resolved by the encoding property,
+        # by (character table encoding, international charset)
+        self._encoding_variants = {}
         self.typefaces = available_fonts
         # Internal use for tests; used only for external/system fonts
         self.current_fontpath: None | Path = None
@@ -375,28 +588,32 @@ class ESCParser:
         # Graphics #############################################################
         self.graphics_mode = False
         self.microweave_mode = False
-        # Get horizontal density with dot density value
-        self.bit_image_horizontal_resolution_mapping = {
-            0: 1 / 60,
-            1: 1 / 120,
-            2: 1 / 120,
-            3: 1 / 240,
-            4: 1 / 80,
-            5: 1 / 72,
-            6: 1 / 90,
-            7: 1 / 144,
-            32: 1 / 60,
-            33: 1 / 120,
-            38: 1 / 90,
-            39: 1 / 180,
-            40: 1 / 360,
-            64: 1 / 60,
-            65: 1 / 120,
-            70: 1 / 90,
-            71: 1 / 180,
-            72: 1 / 360,
-            73: 1 / 360,
-        }
+        # Bit image modes indexed by dot density: horizontal & vertical
+        # resolutions, bytes per column, double speed.
+        # Densities are small integers: a tuple is indexed directly;
+        # unused densities are set to None.
+        # See configure_bit_image()
+        bit_image_modes = [None] * (max(self.bit_image_horizontal_resolution_mapping) + 1)
+        for dot_density_m, h_res in self.bit_image_horizontal_resolution_mapping.items():
+            # Get vertical resolution & expected bytes per column
+            # (influences the number of dots per column)
+            if dot_density_m < 32:
+                # For 9 pins, fixed resolution
+                v_res, bytes_per_column = 1 / 72 if self.pins == 9 else 1 / 60, 1
+            elif dot_density_m < 64:
+                # Should not be available to 9 pins printers
+                v_res, bytes_per_column = 1 / 180, 3
+            else:
+                # Values under 73 (included)
+                # Should not be available for 9 & 24 pins printers
+                v_res, bytes_per_column = 1 / 360, 6
+
+            # Get speed (adjacent dot printing not enabled for the following densities)
+            double_speed = dot_density_m in (2, 3, 40, 72)
+            bit_image_modes[dot_density_m] = (
+                h_res, v_res, bytes_per_column, double_speed
+            )
+        self.bit_image_modes = tuple(bit_image_modes)
         # Raster resolution (ESC . 0 or 1 or 2)
         self.vertical_resolution = None
         self.horizontal_resolution = None
@@ -447,9 +664,10 @@ class ESCParser:
                 self.underline_start = (self.cursor_x * 72, cursor_y * 72 - 1)
             else:
                 # underlining is unset: terminate it by drawing it
-                self.current_pdf.line(
-                    *self.underline_start, self.cursor_x * 72, cursor_y * 72 - 1
-                )
+                # Empty segments are skipped (ex: CR, LF at the left margin)
+                underline_end = (self.cursor_x * 72, cursor_y * 72 - 1)
+                if underline_end != self.underline_start:
+                    self.current_pdf.line(*self.underline_start, *underline_end)
 
         self._underline = value
 
@@ -475,11 +693,12 @@ class ESCParser:
             return
 
         self._color = color
-        LOGGER.debug("Update color: %d (%s)", color, self.color_names[color])
+        if LOGGER.level == DEBUG:
+            LOGGER.debug("Update color: %d (%s)", color, self.color_names[color])
 
         if self.current_pdf:
             # Update PDF setting
-            # self.current_pdf.setFillColor(colors.HexColor(self.RGB_colors[color]))
+            # self.current_pdf.setFillColor(self.RGB_colors[color])
             self.current_pdf.setFillColor(self.CMYK_colors[color])
             self.current_pdf.setStrokeColor(self.CMYK_colors[color])
 
@@ -513,8 +732,14 @@ class ESCParser:
     @point_size.setter
     def point_size(self, point_size: float):
         self._point_size = point_size
-        if self.current_pdf:
+        if (
+            self.current_pdf
+            and not self.set_font_lock
+            # Nothing to do if the size is already in use (often resent)
+            and self.current_pdf._fontsize != point_size
+        ):
             # Redefine the current font (can't just update the point size)
+            # PS: If set_font() is locked, it will do it once unlocked.
             self.current_pdf.setFont(self.current_pdf._fontname, point_size)
 
     @property
@@ -567,8 +792,10 @@ class ESCParser:
             self._double_width = double_width
 
         if old != self.double_width:
-            self.extra_intercharacter_space *= 2 if double_width else 0.5
-            self.character_pitch *= 2 if double_width else 0.5
+            # Powers of 2: no rounding error accumulates over the toggles
+            coef = 2 if double_width else 0.5
+            self.extra_intercharacter_space *= coef
+            self.character_pitch *= coef
 
     def reset_cursor_y(self):
         """Move the Y cursor on top of the printing area
@@ -586,10 +813,6 @@ class ESCParser:
         """
         self.cursor_y = self.top_margin
 
-    def reset_cursor_x(self):
-        """Move the X cursor to the left edge of the printing area (left-margin)"""
-        self._carriage_return()
-
     def set_page_format(self, *args):
         """Set top and bottom margins - ESC ( c
 
@@ -605,10 +828,11 @@ class ESCParser:
                 in constructor)
             single-sheet: top-of-form, last printable line
         """
-        tL, tH, bL, bH = args[1].value
-        unit = self.defined_unit if self.defined_unit else 1 / 360
-        top_margin = ((tH << 8) + tL) * unit
-        bottom_margin = ((bH << 8) + bL) * unit
+        header = args[1].value
+        unit = self.unit_360
+        # tL, tH & bL, bH
+        top_margin = int.from_bytes(header[:2], "little") * unit
+        bottom_margin = int.from_bytes(header[2:], "little") * unit
 
         # Adapt absolute values to bottom-up system, relative to the page size
         # Ex: on a 11 in height paper, 1 in top margin becomes 10 in top margin.
@@ -675,9 +899,8 @@ class ESCParser:
             is at the top-of-form position. Otherwise, the current print position
             becomes the top-of-form position.
         """
-        mL, mH = args[1].value
-        value = (mH << 8) + mL
-        unit = self.defined_unit if self.defined_unit else 1 / 360
+        value = int.from_bytes(args[1].value, "little")
+        unit = self.unit_360
         page_length = value * unit
         LOGGER.debug("page length: %s", page_length)
 
@@ -819,16 +1042,17 @@ class ESCParser:
         default: The right-most column
         """
         # from the left-most mechanically printable position, in the current character pitch
-        character_pitch = 1 / 10 if self.proportional_spacing else self.character_pitch
+        character_pitch = self._effective_character_pitch
         left = self.printable_area[2]
         right_margin = args[1].value[0] * character_pitch + left
 
-        LOGGER.debug(
-            "left margin, right margin, printable area limit (in): %s, %s, %s",
-            self.left_margin,
-            right_margin,
-            self.printable_area_width + left,
-        )
+        if LOGGER.level == DEBUG:
+            LOGGER.debug(
+                "left margin, right margin, printable area limit (in): %s, %s, %s",
+                self.left_margin,
+                right_margin,
+                self.printable_area_width + left,
+            )
         if (
             not self.left_margin + 0.1
             <= right_margin
@@ -870,7 +1094,7 @@ class ESCParser:
 
         default: The left-most column (column 1) (0 value can be received...)
         """
-        character_pitch = 1 / 10 if self.proportional_spacing else self.character_pitch
+        character_pitch = self._effective_character_pitch
         left = self.printable_area[2]
         left_margin = args[1].value[0] * character_pitch + left
 
@@ -893,11 +1117,10 @@ class ESCParser:
         ignore this command if the specified position is to the right of the
         right margin.
         """
-        nL, nH = nL.value[0], nH.value[0]
-        value = (nH << 8) + nL
+        value = int.from_bytes(nL.value + nH.value, "little")
 
         # Should be 1/60 on non ESCP2 (not just 9 pins)
-        unit = 1 / 60 if not self.defined_unit or self.pins == 9 else self.defined_unit
+        unit = self.absolute_horizontal_unit
         cursor_x = value * unit + self.left_margin
 
         LOGGER.debug("set absolute cursor_x: %s", cursor_x)
@@ -917,13 +1140,8 @@ class ESCParser:
 
         ignore this command if it would move the print position outside the printing area.
         """
-        nL, nH = nL.value[0], nH.value[0]
-        value = (nH << 8) + nL
-
-        # Test bit sign
-        if nH & 0x80:
-            # left movement
-            value -= 2**16
+        # Negative values are left movements
+        value = int.from_bytes(nL.value + nH.value, "little", signed=True)
 
         if self.pins == 9:
             unit = 1 / 120
@@ -966,10 +1184,9 @@ class ESCParser:
             Here we use a bottom-up configuration, thus the values must be
             changed in accordingly (origin is at the bottom => signs are inverted!).
         """
-        mL, mH = mL.value[0], mH.value[0]
-        value = (mH << 8) + mL
+        value = int.from_bytes(mL.value + mH.value, "little")
 
-        unit = self.defined_unit if self.defined_unit else 1 / 360
+        unit = self.unit_360
         # sign inverted due to bottom-up
         cursor_y = -value * unit + self.top_margin
 
@@ -1007,14 +1224,10 @@ class ESCParser:
             changed in accordingly (origin is at the bottom => signs are inverted!).
             From the original doc: positive = down movement, negative = up movement.
         """
-        mL, mH = mL.value[0], mH.value[0]
-        value = (mH << 8) + mL
-        # Test bit sign
-        if mH & 0x80:
-            # up movement sent
-            value -= 2**16
-
-        unit = self.defined_unit if self.defined_unit else 1 / 360
+        # Negative values are up movements
+        value = int.from_bytes(mL.value + mH.value, "little", signed=True)
+
+        unit = self.unit_360
         movement_amplitude = value * unit
 
         if movement_amplitude < 0 and -movement_amplitude > 179 / 360:
@@ -1073,6 +1286,10 @@ class ESCParser:
         value = args[1].value[0]
 
         self.defined_unit = value / 3600
+        # Resolve the units of the commands that use the defined unit
+        self.unit_360 = self.defined_unit
+        if self.pins != 9:
+            self.absolute_horizontal_unit = self.defined_unit
 
     def set_18_line_spacing(self, *_):
         """Set the line spacing to 1/8 inch - ESC 0
@@ -1152,7 +1369,8 @@ class ESCParser:
             self.binary_blob(Token("ANYTHING", b" " * n))
         elif m == 1:
             # vertically
-            _ = [self.line_feed() for _ in range(n)]
+            for _ in range(n):
+                self.line_feed()
             self._carriage_return()
             self.double_width = False
 
@@ -1193,7 +1411,7 @@ class ESCParser:
 
         # Scale is applied only on the string part, not intercharacter space
         # that is already updated via the standard implementation.
-        text_width = self.current_pdf.stringWidth(" ", fontSize=point_size)
+        text_width = self.string_width(" ", self.current_pdf._fontname, point_size)
         # use inches: convert pixels to inch
         text_width /= 72
         cursor_x = (
@@ -1243,6 +1461,26 @@ class ESCParser:
             # Their table can't be selected like that.
             return "cp437"
 
+        # Variants are resolved (and registered) only once
+        key = (encoding, self.international_charset)
+        encoding_variant = self._encoding_variants.get(key)
+        if encoding_variant is None:
+            encoding_variant = self._resolve_encoding_variant(encoding)
+            self._encoding_variants[key] = encoding_variant
+        return encoding_variant
+
+    def _resolve_encoding_variant(self, encoding: str) -> str:
+        """Get the encoding to use for the given character table encoding and the
+        current international charset (internal use)
+
+        The base encoding is imported from the local package if it is missing
+        from Python; the variant codec is built and registered if necessary.
+
+        .. seealso:: :meth:`encoding`.
+
+        :param encoding: Encoding of the current character table.
+        :return: Name of the registered encoding.
+        """
         # Try to load the base encoding;
         # First from Python, then from the local package.
         try:
@@ -1263,28 +1501,32 @@ class ESCParser:
             # Nothing to do
             return encoding
 
-        charset = {}
         encoding_variant = encoding
         if encoding not in COMPLETE_ENCODINGS:
-            # Inject the first 32 characters of the table + 0x7f (127)
-            # Tables embedded in Python encodings are incomplete for these points
             encoding_variant += "_mod"
-            charset.update(
-                MISSING_CONTROL_CODES_MAPPING
-                # Specific patch for this encoding. May move in future update...
-                if encoding != "cp864"
-                else CP864_MISSING_CONTROL_CODES_MAPPING
-            )
 
         if self.international_charset:
             # i18n variant is required
             encoding_variant += f"_{CHARSET_NAMES_MAPPING[self.international_charset]}"
-            charset.update(INTERNATIONAL_CHARSETS[self.international_charset])
 
-        # Build a new codec
+        # Build a new codec; the charset is merged only once per variant
         try:
             codecs.lookup(encoding_variant)
         except LookupError:
+            charset = {}
+            if encoding not in COMPLETE_ENCODINGS:
+                # Inject the first 32 characters of the table + 0x7f (127)
+                # Tables embedded in Python encodings are incomplete for these points
+                charset.update(
+                    MISSING_CONTROL_CODES_MAPPING
+                    # Specific patch for this encoding. May move in future update...
+                    if encoding != "cp864"
+                    else CP864_MISSING_CONTROL_CODES_MAPPING
+                )
+
+            if self.international_charset:
+                charset.update(INTERNATIONAL_CHARSETS[self.international_charset])
+
             register_codec_func = partial(
                 getregentry,
                 effective_encoding=encoding_variant,
@@ -1349,7 +1591,8 @@ class ESCParser:
         :type horizontal_scale_coef: float
         :type text: str
         """
-        if not self.current_pdf:
+        if not self.current_pdf or not any(self.scoring_types.values()):
+            # No scoring enabled (0 turns off the scoring)
             return
 
         scoring_types = {
@@ -1357,12 +1600,6 @@ class ESCParser:
             2: cursor_y,  # middle
             3: cursor_y + self.point_size / 3 / 72,  # above
         }
-        scoring_styles = {
-            1: "—",
-            2: "=",  # "＝", FULLWIDTH EQUALS SIGN, not available on various fonts
-            5: "-",
-            6: "=",
-        }
         g = (
             (scoring_type, style)
             for scoring_type, style in self.scoring_types.items()
@@ -1370,7 +1607,7 @@ class ESCParser:
         )
         for scoring_type, style in g:
             offset_y = scoring_types[scoring_type]
-            char = scoring_styles[style]
+            char = SCORING_CHARACTERS[style]
             textobject = self.current_pdf.beginText(self.cursor_x * 72, offset_y * 72)
             textobject.setCharSpace(self.extra_intercharacter_space)
             textobject.setHorizScale(horizontal_scale_coef * 100)
@@ -1457,20 +1694,29 @@ class ESCParser:
                 "Italic table is partially supported: map all italic chars to normal chars"
             )
             # Remap the upper table part to the lower part
-            raw_text = bytearray(i if i < 0x80 else i - 0x80 for i in raw_text)
+            raw_text = raw_text.translate(ITALIC_TO_ROMAN)
         elif self.control_codes_filter:
             # Handle control codes
             # no effect when the italic character table is selected; no characters
             # are defined for these codes in the italic character table.
-            raw_text = bytes(i for i in raw_text if i not in self.control_codes_filter)
+            raw_text = raw_text.translate(None, bytes(self.control_codes_filter))
 
         # Get the encoding according to an enventually international charset set
         encoding_variant = self.encoding
         # LOGGER.debug("Encoding variant in use: %s", encoding_variant)
 
+        # Skip the codec registry lookup of bytes.decode().
+        # The RAM codec is rebuilt under the same name at each
+        # user-defined characters update, its decoder is not kept.
+        decode = self._decoders.get(encoding_variant)
+        if decode is None:
+            decode = codecs.lookup(encoding_variant).decode
+            if encoding_variant != RAM_CHARACTERS_TABLE:
+                self._decoders[encoding_variant] = decode
+
         # Fallback if character is not in the code page
         # Use any of: replace, backslashreplace, ignore
-        text = raw_text.decode(encoding_variant, errors="replace")
+        text, _ = decode(raw_text, "replace")
 
         if encoding in LEFT_TO_RIGHT_ENCODINGS:
             text = text[::-1]
@@ -1480,27 +1726,34 @@ class ESCParser:
         if not text:
             return
 
-        # Handle ESCP2 + ESC X strange behavior: 15cpi + 10.5 or 21pt
-        # artificially reduce the point size as ROM characters are loaded...
-        real_point_size = self._point_size
-        effective_point_size = self.point_size
-        if real_point_size != effective_point_size:
-            self.point_size = effective_point_size
-
-        if self.scripting:
-            # See ESC S command for more documentation of what is done here
-            # Compute the position of the scripting text
-            point_size = self._point_size
-            rise = point_size * 1 / 3
-            if self.scripting == PrintScripting.SUB:
-                # Lower third of the normal character height
-                rise *= -1
-            # Modify point size only if it's greater than 8
-            if point_size > 8:
-                self.point_size = round(point_size * 2 / 3)
-
-            if self.current_pdf:
-                text_width = self.current_pdf.stringWidth(text)
+        if not self.current_pdf:
+            # Nothing to draw: fonts, styles and scoring are skipped,
+            # only the print position is updated below.
+            # Fallback width
+            text_width = len(text) / self.character_pitch
+        else:
+            # Handle ESCP2 + ESC X strange behavior: 15cpi + 10.5 or 21pt
+            # artificially reduce the point size as ROM characters are loaded...
+            real_point_size = self._point_size
+            effective_point_size = self.point_size
+            if real_point_size != effective_point_size:
+                self.point_size = effective_point_size
+
+            if self.scripting:
+                # See ESC S command for more documentation of what is done here
+                # Compute the position of the scripting text
+                point_size = self._point_size
+                rise = point_size * 1 / 3
+                if self.scripting == PrintScripting.SUB:
+                    # Lower third of the normal character height
+                    rise *= -1
+                # Modify point size only if it's greater than 8
+                if point_size > 8:
+                    self.point_size = round(point_size * 2 / 3)
+
+                text_width = self.string_width(
+                    text, self.current_pdf._fontname, self.current_pdf._fontsize
+                )
                 line_width_backup = self.current_pdf._lineWidth
 
                 # Print text
@@ -1524,35 +1777,38 @@ class ESCParser:
                 self.current_pdf.drawText(textobject)
                 self.current_pdf.setLineWidth(line_width_backup)
 
-            # Restore original point size
-            self.point_size = point_size
+                # Restore original point size
+                self.point_size = point_size
 
-        elif self.current_pdf:
-            text_width = self.current_pdf.stringWidth(text)
+            else:
+                text_width = self.string_width(
+                    text, self.current_pdf._fontname, self.current_pdf._fontsize
+                )
 
-            # Print text
-            textobject = self.current_pdf.beginText(self.cursor_x * 72, cursor_y * 72)
-            textobject.setCharSpace(self.extra_intercharacter_space)
-            textobject.setHorizScale(horizontal_scale_coef * 100)
+                # Print text
+                textobject = self.current_pdf.beginText(
+                    self.cursor_x * 72, cursor_y * 72
+                )
+                textobject.setCharSpace(self.extra_intercharacter_space)
+                textobject.setHorizScale(horizontal_scale_coef * 100)
 
-            if self.character_style is not None:
-                self.apply_text_style(cursor_y, horizontal_scale_coef, textobject, text)
-            else:
-                textobject.textOut(text)
+                if self.character_style is not None:
+                    self.apply_text_style(
+                        cursor_y, horizontal_scale_coef, textobject, text
+                    )
+                else:
+                    textobject.textOut(text)
 
-            textobject.setHorizScale(100)
-            self.current_pdf.drawText(textobject)
+                textobject.setHorizScale(100)
+                self.current_pdf.drawText(textobject)
 
-        self.apply_text_scoring(cursor_y, horizontal_scale_coef, text)
+            self.apply_text_scoring(cursor_y, horizontal_scale_coef, text)
 
-        if real_point_size != effective_point_size:
-            # Restore original point size
-            self.point_size = real_point_size
+            if real_point_size != effective_point_size:
+                # Restore original point size
+                self.point_size = real_point_size
 
         # Actualize the x cursor with the apparent width of the written text
-        if not self.current_pdf:
-            # Fallback
-            text_width = len(text) / self.character_pitch
 
         # Add intercharacter space which is not used by stringWidth()
         # PS: not `len(text) - 1`, because there is a trailing space.
@@ -1572,6 +1828,10 @@ class ESCParser:
           the CR command is accompanied by a LF command.
           See the `automatic_linefeed` setting.
         """
+        if self.automatic_linefeed:
+            # LF will call _carriage_return() internally.
+            self.line_feed()
+            return
         self._carriage_return()
 
     def _carriage_return(self):
@@ -1595,6 +1855,10 @@ class ESCParser:
 
         self.cursor_x = self.left_margin
 
+    # Move the X cursor to the left edge of the printing area (left-margin);
+    # an alias avoids an intermediate call.
+    reset_cursor_x = _carriage_return
+
     def line_feed(self, *_):
         """Advance the vertical print position one line (in the currently set line spacing) - LF
 
@@ -1734,16 +1998,24 @@ class ESCParser:
         """
         # Guess the tab position
         # We search the first tab pos AFTER the current cursor_x
-        g = (
-            tab_pos
-            for tab_width in self.horizontal_tabulations
-            if tab_width and ((tab_pos := self.left_margin + tab_width) > self.cursor_x)
-        )
-
+        # Set tabs are in ascending order, followed by unset ones (0)
+        tabulations = self.horizontal_tabulations
+        left_margin = self.left_margin
         try:
-            tab_pos = next(g)
+            tab_count = tabulations.index(0)
+        except ValueError:
+            tab_count = len(tabulations)
+
+        tab_idx = bisect_right(
+            tabulations,
+            self.cursor_x,
+            hi=tab_count,
+            key=lambda tab_width: left_margin + tab_width,
+        )
+        if tab_idx < tab_count:
+            tab_pos = left_margin + tabulations[tab_idx]
             LOGGER.debug("Choosen tab position: %s", tab_pos)
-        except StopIteration:
+        else:
             tab_pos = None
 
         if not tab_pos:
@@ -1818,11 +2090,12 @@ class ESCParser:
 
         try:
             tab_pos = next(g)
-            LOGGER.debug(
-                "Choosen tab position: %s, %s",
-                tab_pos,
-                (self.top_margin - tab_pos) / self.current_line_spacing,
-            )
+            if LOGGER.level == DEBUG:
+                LOGGER.debug(
+                    "Choosen tab position: %s, %s",
+                    tab_pos,
+                    (self.top_margin - tab_pos) / self.current_line_spacing,
+                )
         except StopIteration:
             tab_pos = None
 
@@ -1843,7 +2116,7 @@ class ESCParser:
 
         default: 1 tab position every 8 characters (8, 16, 24, 32, ...)
         """
-        character_pitch = 1 / 10 if self.proportional_spacing else self.character_pitch
+        character_pitch = self._effective_character_pitch
         self.horizontal_tabulations = [8 * i * character_pitch for i in range(1, 33)]
 
     def set_horizontal_tabs(self, *args):
@@ -1881,7 +2154,7 @@ class ESCParser:
             return
 
         prev = column_ids[0]
-        character_pitch = 1 / 10 if self.proportional_spacing else self.character_pitch
+        character_pitch = self._effective_character_pitch
         for tab_idx, tab_width in enumerate(column_ids):
             if tab_width < prev:
                 # a value of n less than the previous n ends tab setting (just like the NUL code).
@@ -1890,11 +2163,12 @@ class ESCParser:
             self.horizontal_tabulations[tab_idx] = tab_width * character_pitch
 
             prev = tab_width
-            LOGGER.debug(
-                "tab set at column %s: %s",
-                tab_idx,
-                self.horizontal_tabulations[tab_idx],
-            )
+            if LOGGER.level == DEBUG:
+                LOGGER.debug(
+                    "tab set at column %s: %s",
+                    tab_idx,
+                    self.horizontal_tabulations[tab_idx],
+                )
 
     def set_vertical_tabs(self, *args):
         """Set vertical tab positions (in the current line spacing) at the lines
@@ -1921,12 +2195,13 @@ class ESCParser:
             self.vertical_tabulations[tab_idx] = tab_height * self.current_line_spacing
 
             prev = tab_height
-            LOGGER.debug(
-                "tab %d set at line %s: %s",
-                tab_idx,
-                tab_height,
-                self.vertical_tabulations[tab_idx],
-            )
+            if LOGGER.level == DEBUG:
+                LOGGER.debug(
+                    "tab %d set at line %s: %s",
+                    tab_idx,
+                    tab_height,
+                    self.vertical_tabulations[tab_idx],
+                )
 
     def set_italic(self, *_):
         """Enable italic style - ESC 4"""
@@ -1971,6 +2246,20 @@ class ESCParser:
             for fontname in fontnames
         ]
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def string_width(text: str, fontname: str, font_size: float) -> float:
+        """Get the width of the given text with the given font (internal usage)
+
+        The function is cached: the same words, spaces, rules, etc. are often
+        printed repeatedly with the same font.
+
+        .. seealso:: :meth:`reportlab.pdfbase.pdfmetrics.stringWidth`.
+
+        :return: Width in points (1/72 inch).
+        """
+        return pdfmetrics.stringWidth(text, fontname, font_size)
+
     def set_font(self) -> bool:
         """Configure the current font (internal usage)
 
@@ -2038,7 +2327,13 @@ class ESCParser:
             LOGGER.debug("Loaded & used reportlab font: %s", fontname)
             self.condensed_autoscaling = True
 
-        self.current_pdf.setFont(fontname, self.point_size)
+        point_size = self.point_size
+        if (
+            # Nothing to do if the font is already in use (often reselected)
+            fontname != self.current_pdf._fontname
+            or point_size != self.current_pdf._fontsize
+        ):
+            self.current_pdf.setFont(fontname, point_size)
         return True
 
     def assign_character_table(self, *args):
@@ -2166,11 +2461,12 @@ class ESCParser:
         value = args[1].value[0]
         self.international_charset = value
 
-        LOGGER.debug(
-            "Select international charset variant %s (%s)",
-            value,
-            CHARSET_NAMES_MAPPING[value],
-        )
+        if LOGGER.level == DEBUG:
+            LOGGER.debug(
+                "Select international charset variant %s (%s)",
+                value,
+                CHARSET_NAMES_MAPPING[value],
+            )
 
     def select_letter_quality_or_draft(self, *args):
         """Select either LQ or draft printing - ESC x
@@ -2259,7 +2555,8 @@ class ESCParser:
         else:
             self.typeface = value
 
-        LOGGER.debug("Select printer typeface %s", TYPEFACE_NAMES[self.typeface])
+        if LOGGER.level == DEBUG:
+            LOGGER.debug("Select printer typeface %s", TYPEFACE_NAMES[self.typeface])
 
         if not self.set_font():
             # Something bad happened: keep the old value
@@ -2324,9 +2621,10 @@ class ESCParser:
         # Sync current settings and reset RAM characters if necessary
         self.user_defined.extract_settings(self)
 
-        LOGGER.debug("Current PrintMode: %s", self.mode)
-        LOGGER.debug("Current Proportional status: %s", self._proportional_spacing)
-        LOGGER.debug("Current Scripting status: %s", self.scripting)
+        if LOGGER.level == DEBUG:
+            LOGGER.debug("Current PrintMode: %s", self.mode)
+            LOGGER.debug("Current Proportional status: %s", self._proportional_spacing)
+            LOGGER.debug("Current Scripting status: %s", self.scripting)
 
         # Number of bytes in a column
         # Normal characters: 24/48 and 9 pins NLQ
@@ -2357,7 +2655,8 @@ class ESCParser:
             md5_digest = md5(data).hexdigest()[:7]
             self.user_defined.add_char(md5_digest, char_code)
 
-            LOGGER.debug("Received char; code %s (%d)", format(char_code, '#04x'), char_code)
+            if LOGGER.level == DEBUG:
+                LOGGER.debug("Received char; code %s (%d)", format(char_code, '#04x'), char_code)
 
             if not self.userdef_images_path:
                 continue
@@ -2436,7 +2735,7 @@ class ESCParser:
         typeface = args[1].value[0]
 
         if self.multipoint_mode:
-            # Used in place of @multipoint_mode_ignore (for logging purposes)
+            # Ignored like other commands during multipoint mode, but logged
             LOGGER.error("You cannot copy ROM characters to RAM during multipoint mode.")
             return
 
@@ -2539,9 +2838,9 @@ class ESCParser:
         During multipoint mode the printer ignores the ESC W, ESC w, ESC SP,
         DC2, DC4, SI, ESC SI, SO, and ESC SO commands.
         ESC k is ignored if typeface is not available in scalable/multipoint mode.
-        See the decorator :meth:`multipoint_mode_ignore`.
+        These commands return early when multipoint mode is enabled.
         """
-        m, nL, nH = args[1].value
+        m = args[1].value[0]
 
         # Allow the use of scalable fonts
         self.multipoint_mode = True
@@ -2556,13 +2855,12 @@ class ESCParser:
             self.proportional_spacing = False
 
         # Point size
-        point_size = ((nH << 8) + nL) / 2
+        point_size = int.from_bytes(args[1].value[1:], "little") / 2
 
         if point_size:
             self.point_size = point_size
 
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
 
     def cancel_multipoint_mode(self):
         """Cancel multipoint mode & HMI
@@ -2575,8 +2873,7 @@ class ESCParser:
         """
         # Cancel select_font_by_pitch_and_point() ESC X command
         self.multipoint_mode = False
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
         # Return to 10.5-point (in theory for ESCP2/ESCP printers only)
         # PS: In fact on 9pins printers, point size can only
         # be 10.5 or 21 (in double-height mode only) (so always 10.5).
@@ -2587,21 +2884,6 @@ class ESCParser:
         # self.point_size = 10.5  # From the manual's implementation for ESCP2 only
         self.point_size = 21 if self.double_height else 10.5
 
-    @staticmethod
-    def multipoint_mode_ignore(func):
-        """Decorator used to ignore the function if the multipoint mode is enabled
-
-        Multipoint mode is the use of a scalable version of the current font.
-        """
-
-        def modified_func(self, *args, **kwargs):
-            """Returned modified function"""
-            if self.multipoint_mode:
-                return
-            return func(self, *args, **kwargs)
-
-        return modified_func
-
     def set_horizontal_motion_index(self, *args):
         """Set the character width (HMI) - ESC c
 
@@ -2629,20 +2911,41 @@ class ESCParser:
           See :meth:`point_size`, :meth:`binary_blob`,
           meth:`select_font_by_pitch_and_point` implementations.
         """
-        nL, nH = args[1].value
-        value = (nH << 8) + nL
-        hmi = value / 360
+        value = int.from_bytes(args[1].value, "little")
 
-        if not 0 < hmi <= 3:
+        # Check the raw value: 0 < HMI <= 3 inches, in 1/360 inch units
+        if not 0 < value <= 1080:
             LOGGER.warning(
-                "HMI should be > to 0 and <= to 3 inches (%s) => ignored", hmi
+                "HMI should be > to 0 and <= to 3 inches (%s) => ignored", value / 360
             )
             return
 
-        self.character_width = hmi
+        self.character_width = value / 360
+        self._update_effective_character_pitch()
         # Cancel extra space set_intercharacter_space ESC SP command
         self.extra_intercharacter_space = 0
 
+    def _cancel_hmi(self):
+        """Cancel HMI :meth:`set_horizontal_motion_index` ESC c command
+
+        Internal use only. Called by all the commands that cancel the HMI.
+        """
+        self.character_width = None
+        self._update_effective_character_pitch()
+
+    def _update_effective_character_pitch(self):
+        """Update the character pitch used by margins & tabulations settings
+
+        Internal use only. Called each time the character pitch, the HMI or
+        the proportional spacing status is modified.
+
+        Margins & tabulations are calculated based on 10 cpi if proportional
+        spacing is selected.
+        """
+        self._effective_character_pitch = (
+            1 / 10 if self._proportional_spacing else self.character_pitch
+        )
+
     @property
     def character_pitch(self) -> float:
         """Get the character pitch
@@ -2658,6 +2961,7 @@ class ESCParser:
     def character_pitch(self, value: float):
         """Set the character pitch (in inches per character unit)"""
         self._character_pitch = value
+        self._update_effective_character_pitch()
 
     @property
     def proportional_spacing(self) -> bool:
@@ -2677,6 +2981,7 @@ class ESCParser:
         .. seealso:: :meth:`switch_proportional_mode`, :meth:`master_select`.
         """
         self._proportional_spacing = proportional_spacing in (1, 49)
+        self._update_effective_character_pitch()
 
         self.set_font()
 
@@ -2716,7 +3021,6 @@ class ESCParser:
         self.cancel_multipoint_mode()
         self.proportional_spacing = args[1].value[0]
 
-    @multipoint_mode_ignore
     def set_intercharacter_space(self, *args):
         """Increase the space between characters by n/180 inch in LQ mode
         and n/120 inch in draft mode - ESC SP
@@ -2732,13 +3036,16 @@ class ESCParser:
         9 pins:
             Increases the space between characters by n/120 inch
         """
+        if self.multipoint_mode:
+            # Ignored during multipoint mode
+            return
+
         # 3rd argument, see the terminal independant def in the grammar (SP is a control code)
         value = args[2].value[0]
 
         coef = 180 if self.mode == PrintMode.LQ and self.pins != 9 else 120
         self.extra_intercharacter_space = value / coef
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
 
     def master_select(self, *args):
         """Select any combination of several font attributes and enhancements - ESC !
@@ -2780,7 +3087,10 @@ class ESCParser:
         # Mandatory for bold & italic that are not properties that trigger
         # set_font()
         self.set_font_lock = False
-        self.set_font()
+        if not self.set_font() and self.current_pdf:
+            # Font not changed: apply the point size reset by
+            # cancel_multipoint_mode() to the current font
+            self.current_pdf.setFont(self.current_pdf._fontname, self.point_size)
 
     def set_double_strike_printing(self, *_):
         """Print each dot twice, with the second slightly below the first, creating bolder characters - ESC G
@@ -2821,29 +3131,20 @@ class ESCParser:
             See :meth:`apply_text_scoring`.
         """
         scoring_type_d1, scoring_style_d2 = args[1].value
-        scoring_types = {
-            1: "Underline",  # below
-            2: "Strikethrough",  # middle
-            3: "Overscore",  # above
-        }
-        scoring_styles = {
-            0: "Turn off scoring",
-            1: "Single continuous line",
-            2: "Double continuous line",
-            5: "Single broken line",
-            6: "Double broken line",
-        }
-        LOGGER.debug(
-            "Scoring: %s, %s",
-            scoring_types[scoring_type_d1],
-            scoring_styles[scoring_style_d2],
-        )
 
         # if scoring_type_d1 == 1:
         #     # Handle underline
         #     self.underline = scoring_style_d2 == 1
         self.scoring_types[scoring_type_d1] = scoring_style_d2
 
+        if LOGGER.level != DEBUG:  # pragma: no cover
+            return
+        LOGGER.debug(
+            "Scoring: %s, %s",
+            SCORING_TYPE_NAMES[scoring_type_d1],
+            SCORING_STYLE_NAMES[scoring_style_d2],
+        )
+
     def set_script_printing(self, *args):
         """Print characters that follow at about 2/3 their normal height - ESC S
 
@@ -2904,27 +3205,14 @@ class ESCParser:
         - Todo: does not affect graphics characters
         """
         value = args[1].value[0]
-        # Map character style ids with reportlab text render modes
-        character_style_mapping = {
-            0: None,
-            1: PrintCharacterStyle.OUTLINE,
-            2: PrintCharacterStyle.FILL,
-            3: PrintCharacterStyle.SHADOW,
-        }
         # We use reportlab text render modes in this attribute! Not the ESC style id!
-        self.character_style = character_style_mapping.get(value)
+        self.character_style = CHARACTER_STYLE_MAPPING.get(value)
 
         if LOGGER.level != DEBUG:  # pragma: no cover
             return
-        character_style_names = {
-            0: "Turn off outline/shadow printing",
-            1: "Turn on outline printing",
-            2: "Turn on shadow printing",
-            3: "Turn on outline and shadow printing",
-        }
         LOGGER.debug(
             "Set character style: %s; text render: %s",
-            character_style_names.get(value),
+            CHARACTER_STYLE_NAMES.get(value),
             self.character_style,
         )
 
@@ -2934,7 +3222,6 @@ class ESCParser:
         return self._condensed
 
     @condensed.setter
-    @multipoint_mode_ignore
     def condensed(self, condensed: bool):
         """Switch condensed printing mode and update character pitch
 
@@ -2949,16 +3236,19 @@ class ESCParser:
         Called by :meth:`select_condensed_printing`, :meth:`unset_condensed_printing`,
         :meth:`master_select` (SI, ESC SI, DC2, ESC ! commands).
         """
+        if self.multipoint_mode:
+            # Ignored during multipoint mode
+            return
+
         if self.character_pitch == 1 / 15 and self.pins != 9:
             # Ignore due to ESC g action for ESCP2 only
             return
         if self.pins == 9 and self.proportional_spacing:
             return
 
-        # Cancel HMI set_horizontal_motion_index() ESC c command
         # Note: the position is OK: ESC c is only used on ESCP2 printers,
         # thus, here the command can't be ignored.
-        self.character_width = None
+        self._cancel_hmi()
 
         if condensed == self._condensed:
             # Do not modify settings twice
@@ -2974,24 +3264,17 @@ class ESCParser:
         LOGGER.debug("Set condensed printing: %s", condensed)
 
         # Update character pitch
-        if condensed:
-            if self.proportional_spacing:
-                self.character_pitch *= 0.5
-            elif self.character_pitch == 1 / 10:
-                self.character_pitch = 1 / 17.14
-            elif self.character_pitch == 1 / 12:
-                self.character_pitch = 1 / 20
+        if self.proportional_spacing:
+            self.character_pitch *= 0.5 if condensed else 2
         else:
-            if self.proportional_spacing:
-                self.character_pitch *= 2
-            elif self.character_pitch == 1 / 17.14:
-                self.character_pitch = 1 / 10
-            elif self.character_pitch == 1 / 20:
-                self.character_pitch = 1 / 12
+            character_pitch = (
+                CONDENSED_PITCHES if condensed else UNCONDENSED_PITCHES
+            ).get(self.character_pitch)
+            if character_pitch:
+                self.character_pitch = character_pitch
 
         self.set_font()
 
-    @multipoint_mode_ignore
     def select_condensed_printing(self, *_):
         """Enter condensed mode, in which character width is reduced - SI, ESC SI
 
@@ -3003,12 +3286,14 @@ class ESCParser:
             - 1/10 : 1/17.14
             - 1/12 : 1/20
         """
+        if self.multipoint_mode:
+            # Ignored during multipoint mode
+            return
+
         self.condensed = True
 
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
 
-    @multipoint_mode_ignore
     def unset_condensed_printing(self, *_):
         """Cancel condensed printing selected by the SI or ESC SI commands - DC2
 
@@ -3019,13 +3304,15 @@ class ESCParser:
             - 1/17.14 : 1/10
             - 1/20 : 1/12
         """
+        if self.multipoint_mode:
+            # Ignored during multipoint mode
+            return
+
         # Reset character pitch
         self.condensed = False
 
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
 
-    @multipoint_mode_ignore
     def select_double_width_printing(self, *_):
         """Double the width of all characters, spaces, and intercharacter spacing
         (set with the ESC SP command) following this command ON THE SAME LINE. - SO, ESC SO
@@ -3045,14 +3332,17 @@ class ESCParser:
             and with a CR command.
             (normal behavior).
         """
+        if self.multipoint_mode:
+            # Ignored during multipoint mode
+            return
+
         self.double_width = True
 
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
 
-        LOGGER.debug("Double-width one line status: %s", self.double_width)
+        if LOGGER.level == DEBUG:
+            LOGGER.debug("Double-width one line status: %s", self.double_width)
 
-    @multipoint_mode_ignore
     def unset_double_width_printing(self, *_):
         """Cancels double-width printing selected by the SO or ESC SO commands - DC4
 
@@ -3062,14 +3352,17 @@ class ESCParser:
         Does not cancel double-width printing selected with the ESC W command.
         => distinction between 1-line and multiline.
         """
+        if self.multipoint_mode:
+            # Ignored during multipoint mode
+            return
+
         self.double_width = False
 
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
 
-        LOGGER.debug("Double-width one line status: %s", self.double_width)
+        if LOGGER.level == DEBUG:
+            LOGGER.debug("Double-width one line status: %s", self.double_width)
 
-    @multipoint_mode_ignore
     def switch_double_width_printing(self, *args):
         """Turn on/off double-width printing of all characters, spaces,
         and intercharacter spacing (set with the ESC SP command) - ESC W
@@ -3083,15 +3376,17 @@ class ESCParser:
         .. seealso:: :meth:`select_double_width_printing`,
             :meth:`unset_double_width_printing`
         """
+        if self.multipoint_mode:
+            # Ignored during multipoint mode
+            return
+
         value = args[1].value[0]
         self.double_width_multi = value in (1, 49)
 
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
 
         LOGGER.debug("Double-width multiline status: %s", self.double_width)
 
-    @multipoint_mode_ignore
     def switch_double_height_printing(self, *args):
         """Turns on/off double-height printing of all characters - ESC w
 
@@ -3113,11 +3408,18 @@ class ESCParser:
             - Todo: and high-speed draft printing;
             They all resume when double-height printing is canceled.
         """
+        if self.multipoint_mode:
+            # Ignored during multipoint mode
+            return
+
         value = args[1].value[0]
         double_height = value in (1, 49)
 
         if double_height != self.double_height:
-            self.point_size *= 2 if double_height else 0.5
+            # Multipoint mode is disabled here, so the point size can only be
+            # 10.5 or 21 (see cancel_multipoint_mode()): set it from the
+            # double-height state instead of scaling the current value.
+            self.point_size = 21 if double_height else 10.5
 
         if self.pins == 9:
             if double_height:
@@ -3141,8 +3443,7 @@ class ESCParser:
 
         self.double_height = double_height
 
-        # Cancel HMI set_horizontal_motion_index() ESC c command
-        self.character_width = None
+        self._cancel_hmi()
 
         LOGGER.debug("Double-height status: %s", self.double_height)
         LOGGER.debug("scripting status: %s", self.scripting)
@@ -3357,7 +3658,9 @@ class ESCParser:
         """
         # v_dot_count_m (number of rows of dots): 1, 8, or 24
         # (9 or 16 can be encountered on some configs, see #2)
-        graphics_mode, v_res, h_res, v_dot_count_m, nL, nH = args[1].value
+        graphics_mode, v_res, h_res, v_dot_count_m, h_dot_count = (
+            RASTER_GRAPHICS_HEADER.unpack(args[1].value)
+        )
         if self.microweave_mode and v_dot_count_m != 1:
             # In these settings, one raster line printed at a time
             # However we assume that the data is formatted for the given
@@ -3372,10 +3675,8 @@ class ESCParser:
         self.vertical_resolution = v_res / 3600
         self.horizontal_resolution = h_res / 3600
 
-        # Number of columns of dots
-        h_dot_count = (nH << 8) + nL
         # Used by print_raster_graphics_dots() to chunk data stream
-        self.bytes_per_line = int((h_dot_count + 7) / 8)
+        self.bytes_per_line = (h_dot_count + 7) // 8
 
         if LOGGER.level == DEBUG:
             expected_bytes = v_dot_count_m * self.bytes_per_line
@@ -3428,21 +3729,18 @@ class ESCParser:
         :type data: bytearray
         :type h_dot_count: int
         """
-        code = self.current_pdf._code
+        # Local variables are preferable in the loops below as they reduce
+        # the indirection level (see print_bit_image_dots()).
+        code_append = self.current_pdf._code.append
+        float_format = "{:.2f}".format
         horizontal_resolution = self.horizontal_resolution
         vertical_resolution = self.vertical_resolution
+        bytes_per_line = self.bytes_per_line
         cursor_x = self.cursor_x
         cursor_y = self.cursor_y
         dots = self.dots_as_circles
 
-        def chunk_this(iterable, length):
-            """Split iterable in chunks of equal sizes"""
-            iterator = iter(iterable)
-            for _ in range(0, len(iterable), length):
-                yield tuple(it.islice(iterator, length))
-
-        mask = 0x80
-        overflow_mask = 0xff
+        reversed_bytes = REVERSED_BYTES
         y_pos = cursor_y
         column_offset = i = 0
 
@@ -3451,44 +3749,70 @@ class ESCParser:
             # Configure linewidth
             # No noop to end previous path (useless here)
             linewidth = round(horizontal_resolution * 72 * 1.28, 2)
-            code.append(f"1 J {linewidth} w")
+            code_append(f"1 J {linewidth} w")
         else:
-            h_res = "{:.2f}".format(horizontal_resolution * 72).rstrip("0")
-            v_res = "{:.2f}".format(vertical_resolution * 72).rstrip("0")
-            rect_suffix = f" {h_res} {v_res} re"
+            v_res = float_format(vertical_resolution * 72).rstrip("0")
 
         # Iterate on bytes inside lines
-        # Iterate on lines first
-        for line_bytes in chunk_this(data, self.bytes_per_line):
+        # Iterate on lines first; slices of the memoryview are not copied
+        data = memoryview(data)
+        for line_start in range(0, len(data), bytes_per_line):
+            line_bytes = data[line_start:line_start + bytes_per_line]
             # Keep track of the x position in the current line
             column_offset = 0
-            cy = "{:.2f}".format(y_pos * 72).rstrip("0")
+            cy = float_format(y_pos * 72).rstrip("0")
+
+            if not dots:
+                # Rectangles: horizontally adjacent dots are merged into one
+                # rectangle per run of set bits; the width of the rectangle
+                # is the length of the run.
+                line_int = int.from_bytes(line_bytes, "big")
+                line_bits = len(line_bytes) * 8
+                while line_int:
+                    # The MSB is the first dot of the run
+                    run_start = line_int.bit_length()
+                    # The first unset bit after the MSB ends the run
+                    run_end = (~line_int & ((1 << run_start) - 1)).bit_length()
+                    x_pos = cursor_x + (line_bits - run_start) * horizontal_resolution
+                    cx = float_format(x_pos * 72).rstrip("0")
+                    width = (run_start - run_end) * horizontal_resolution * 72
+                    width = float_format(width).rstrip("0")
+                    code_append(f"{cx} {cy} {width} {v_res} re")
+                    # Consume the run
+                    line_int &= (1 << run_end) - 1
+
+                # Same x offsets as the ones obtained with circles (see below)
+                column_offset = line_bits
+                last_byte = line_bytes[-1] if line_bytes else 0
+                i = 9 - (last_byte & -last_byte).bit_length() if last_byte else 0
+
+                y_pos -= vertical_resolution
+                code_append("f")
+                continue
+
             for col_int in line_bytes:
-                # Consume all bits of the current byte
-                # at each loop the current byte is shifted to the left with an offset of 1.
-                # This avoids testing the remaining bits if their value is zero.
+                # Consume only the set bits of the current byte.
+                # The byte is reversed so that the lowest set bit is the
+                # leftmost dot; its position is given by bit_length().
+                col_int = reversed_bytes[col_int]
                 i = 0
                 while col_int:
-                    if col_int & mask:
-                        x_pos = cursor_x + (column_offset + i) * horizontal_resolution
-                        # print("offset, i: x,y", column_offset, i, x_pos, y_pos)
-                        cx = "{:.2f}".format(x_pos * 72).rstrip("0")
-                        code.append(
-                            f"{cx} {cy} m {cx} {cy} l"
-                            if dots
-                            else (f"{cx} {cy}" + rect_suffix),
-                        )
-                    # Consume the MSB
-                    col_int = overflow_mask & (col_int << 1)
-                    i += 1
+                    lowest_bit = col_int & -col_int
+                    # Position of the dot in the byte + 1
+                    i = lowest_bit.bit_length()
+                    x_pos = cursor_x + (column_offset + i - 1) * horizontal_resolution
+                    cx = float_format(x_pos * 72).rstrip("0")
+                    code_append(f"{cx} {cy} m {cx} {cy} l")
+                    # Consume the dot
+                    col_int ^= lowest_bit
                 column_offset += 8
 
             # Print the next line below
             y_pos -= vertical_resolution
 
-            # Close path and stroke or fill
+            # Close path and stroke
             # => can be at the upper level, but breaks 1dot_v_band test
-            code.append("S" if dots else "f")
+            code_append("S")
 
         # Get rid of the last bits of potentially, partially used last byte
         # (just use the number of expected dots).
@@ -3512,19 +3836,27 @@ class ESCParser:
         In the last case, the printer repeats the following byte of data the
         specified number of times.
 
+        .. seealso:: :meth:`escapy.grammar.RLE_LENGTHS` for the lengths encoded
+            by the counters.
+
         :return: Decompressed data.
         """
         decompressed_data = bytearray()
-        iter_data = iter(compressed_data)
-        for counter in iter_data:
+        data_size = len(compressed_data)
+        i = 0
+        while i < data_size:
+            counter = compressed_data[i]
+            length = RLE_LENGTHS[counter]
+            i += 1
             if counter & 0x80:
                 # Repeat counters: number of times to repeat data
-                repeat = 256 - counter + 1
-                decompressed_data += (next(iter_data)).to_bytes(1) * repeat
+                # PS: Indexing fails if the data byte is missing (truncated data)
+                decompressed_data += compressed_data[i].to_bytes(1) * length
+                i += 1
             else:
                 # Data-length counters: number of data bytes to follow
-                block_length = counter + 1
-                decompressed_data += bytearray(it.islice(iter_data, block_length))
+                decompressed_data += compressed_data[i:i + length]
+                i += length
 
         return decompressed_data
 
@@ -3627,7 +3959,7 @@ class ESCParser:
 
         self._carriage_return()
 
-        unit = self.defined_unit if self.defined_unit else 1 / 360
+        unit = self.unit_360
         self.cursor_y -= dot_offset * unit
 
     def set_movx_unit_8dots(self, *_):
@@ -3668,7 +4000,7 @@ class ESCParser:
             THUS, we can use the ESC ( U setting here (and not in the MOVX command),
             since it can't be changed in the meantime (the command is not allowed).
         """
-        unit = self.defined_unit if self.defined_unit else 1 / 360
+        unit = self.unit_360
         self.movx_unit = dot_unit * unit
 
     def set_printing_color_ex(self, *args):
@@ -3721,8 +4053,7 @@ class ESCParser:
 
         doc p184, p298 (full table)
         """
-        dot_density_m, nL, nH = args[1].value
-        dot_columns_nb = (nH << 8) + nL
+        dot_density_m, dot_columns_nb = BIT_IMAGE_HEADER.unpack(args[1].value)
 
         # Configure the bit image printing mode according to the given dot density
         self.configure_bit_image(dot_density_m)
@@ -3745,6 +4076,63 @@ class ESCParser:
         data = args[2].value
         self.print_bit_image_dots(data)
 
+    @staticmethod
+    def unpack_bit_image_columns(
+        data, bytes_per_column, double_speed=False, extended_dots=False
+    ) -> np.ndarray:
+        """Get the dots to print from bit image data
+
+        Internal use; see :meth:`print_bit_image_dots`.
+        All the columns are unpacked at once: 1 row of bits per column, the MSB
+        (top dot) first. A partial last column is right-aligned.
+
+        :param data: Bytes of graphics data; any object exposing the buffer
+            protocol is accepted.
+        :param bytes_per_column: Number of bytes that define a column of dots.
+        :key double_speed: Adjacent dots of a line are not printed
+            (default: False).
+        :key extended_dots: Support of print heads with 9 pins; only the 1st bit
+            of the 2nd byte of a column is used (default: False).
+        :type data: bytearray | bytes | memoryview
+        :type bytes_per_column: int
+        :type double_speed: bool
+        :type extended_dots: bool
+        :return: Matrix of dots (1 for a dot to print, 0 otherwise) of shape
+            (number of columns, 8 * bytes_per_column), or
+            (number of columns, 9) with extended_dots.
+        """
+        # Zero-copy view on the buffer
+        data = np.frombuffer(data, dtype=np.uint8)
+        remainder = len(data) % bytes_per_column
+        if remainder:
+            # Copy the data once, leaving the padding bytes to 0
+            padded = np.zeros(len(data) - remainder + bytes_per_column, dtype=np.uint8)
+            padded[:-bytes_per_column] = data[:-remainder]
+            padded[-remainder:] = data[-remainder:]
+            data = padded
+        # For 9pins print heads, only the 1st bit of the 2nd byte is used:
+        # the ignored bits are not even unpacked.
+        columns = np.unpackbits(
+            data.reshape(-1, bytes_per_column),
+            axis=1,
+            count=9 if extended_dots else None,
+        )
+
+        if double_speed:
+            # Clear bits using the previous column as a bitmask: in a horizontal
+            # run of dots, only the 1st, 3rd, etc. dots are kept.
+            # The rank of a dot in its run is its distance to the last blank.
+            # PS: A mask made of the unmodified previous column is not enough:
+            # it would clear the 3rd dot of a run.
+            indexes = np.arange(len(columns), dtype=np.int32)[:, np.newaxis]
+            last_blanks = np.maximum.accumulate(
+                np.where(columns, np.int32(-1), indexes), axis=0
+            )
+            # Keep the dots with an odd rank
+            columns &= ((indexes - last_blanks) & 1).astype(np.uint8)
+
+        return columns
+
     def print_bit_image_dots(self, data, extended_dots=False):
         """Print dots in bit image data for 9, 24, 48 pins printers
 
@@ -3790,30 +4178,35 @@ class ESCParser:
         # For a function called hundreds of thousands or even millions of times,
         # local variables are preferable as they reduce the indirection level.
         double_speed = self.double_speed
-        code = self.current_pdf._code
+        code_append = self.current_pdf._code.append
+        float_format = "{:.2f}".format
         horizontal_resolution = self.horizontal_resolution
         vertical_resolution = self.vertical_resolution
         cursor_x = self.cursor_x
         cursor_y = self.cursor_y
         dots = self.dots_as_circles
+        bytes_per_column = self.bytes_per_column
 
-        def chunk_this(iterable, length):
-            """Split iterable in chunks of equal sizes
-
-            .. todo:: Update this with itertools.batched for the 3.12 migration;
-                this is twice as fast.
-            """
-            iterator = iter(iterable)
-            for _ in range(0, len(iterable), length):
-                yield int.from_bytes(it.islice(iterator, length), "big")
+        columns = self.unpack_bit_image_columns(
+            data, bytes_per_column, double_speed, extended_dots
+        )
 
-        # Consume all bits of the current value (can be multiple bytes)
-        # at each loop the current byte is shifted to the left with an offset of 1.
-        # This avoids testing the remaining bits if their value is zero.
-        mask = 1 << (self.bytes_per_column * 8 - 1)
-        overflow_mask = 2 ** (8 * self.bytes_per_column) - 1
-        prev_col_int = 0
+        # Positions of the columns; the last one is the final print position
+        x_positions = list(
+            it.accumulate(
+                it.repeat(horizontal_resolution, len(columns)), initial=cursor_x
+            )
+        )
+        # Positions of the rows are the same for all columns: move the local
+        # cursor_y down at each bit.
+        # Do not search further, it IS the most efficient way to
+        # round & strip trailing zeroes (to save space).
+        y_positions = [
+            float_format((cursor_y - i * vertical_resolution) * 72).rstrip("0")
+            for i in range(columns.shape[1])
+        ]
 
+        previous_column = None
         if dots:
             # Circles: Bézier curves are not used in order to avoid heavy
             # memory, CPU & disk overload. Instead, for a point, we use a line with
@@ -3826,54 +4219,52 @@ class ESCParser:
             linewidth = round(
                 max(horizontal_resolution, vertical_resolution) * 72 * 1.28, 2
             )
-            code.append(f"1 J {linewidth} w")
+            code_append(f"1 J {linewidth} w")
+
+            # Iterate on set dots only, column after column, from top to bottom
+            for column, i in zip(*(axis.tolist() for axis in columns.nonzero())):
+                if column != previous_column:
+                    cx = float_format(x_positions[column] * 72).rstrip("0")
+                    previous_column = column
+
+                cy = y_positions[i]
+                code_append(f"{cx} {cy} m {cx} {cy} l")
+
+            # Close path and stroke
+            code_append("S")
         else:
-            # Rectangles: width and height are the current H/V resolutions.
-            # The prefix including the coordinates is added in the loop.
+            # Rectangles: vertically adjacent dots of a column are merged into
+            # one rectangle per run of set bits; the height of the rectangle
+            # is the length of the run. The width is the H resolution.
             # We use a fill directive here.
-            h_res = "{:.2f}".format(horizontal_resolution * 72).rstrip("0")
-            v_res = "{:.2f}".format(vertical_resolution * 72).rstrip("0")
-            rect_suffix = f" {h_res} {v_res} re"
-
-        # Iterate on bytes inside columns
-        for col_int in chunk_this(data, self.bytes_per_column):
-            # if cursor_x >= self.right_margin:
-            #     continue
-
-            if double_speed:
-                # Clear bits using the previous column as a bitmask
-                col_int &= ~prev_col_int
-                prev_col_int = col_int
-
-            if extended_dots:
-                # For 9pins print heads, only the 1st bit of the 2nd byte is used
-                col_int &= 0xff80
-
-            # Do not search further, it IS the most efficient way to
-            # round & strip trailing zeroes (to save space).
-            cx = "{:.2f}".format(cursor_x * 72).rstrip("0")
-            i = 0
-            while col_int:
-                if col_int & mask:
-                    # At each bit, move the local cursor_y down
-                    y_pos = cursor_y - i * vertical_resolution
-                    cy = "{:.2f}".format(y_pos * 72).rstrip("0")
-                    code.append(
-                        f"{cx} {cy} m {cx} {cy} l"
-                        if dots
-                        else (f"{cx} {cy}" + rect_suffix)
-                    )
-                i += 1
-                # Consume the MSB
-                col_int = (col_int << 1) & overflow_mask
+            h_res = float_format(horizontal_resolution * 72).rstrip("0")
+            # Blank columns (margins, spaces) are skipped before searching runs;
+            # indexes of the remaining columns are mapped back to their position.
+            printed_columns = np.flatnonzero(columns.any(axis=1))
+            # Edges of the runs: 1 on their first dot, -1 after their last dot
+            edges = np.diff(
+                columns[printed_columns].astype(np.int8), axis=1, prepend=0, append=0
+            )
+            run_columns, run_starts = (edges == 1).nonzero()
+            run_columns = printed_columns[run_columns].tolist()
+            run_starts = run_starts.tolist()
+            run_ends = (edges == -1).nonzero()[1].tolist()
 
-            # Increment global cursor_x
-            cursor_x += horizontal_resolution
+            for column, run_start, run_end in zip(run_columns, run_starts, run_ends):
+                if column != previous_column:
+                    cx = float_format(x_positions[column] * 72).rstrip("0")
+                    previous_column = column
 
-        # Close path and stroke or fill
-        code.append("S" if dots else "f")
+                # The rectangle is drawn upward from the bottom of its last dot
+                cy = y_positions[run_end - 1]
+                height = (run_end - run_start) * vertical_resolution * 72
+                height = float_format(height).rstrip("0")
+                code_append(f"{cx} {cy} {h_res} {height} re")
 
-        self.cursor_x = cursor_x
+            # Close path and fill
+            code_append("f")
+
+        self.cursor_x = x_positions[-1]
 
     def configure_bit_image(self, dot_density_m):
         """Configure the bit image printing mode according to the given dot density (internal usage)
@@ -3893,26 +4284,13 @@ class ESCParser:
             vertical resolutions, and bytes per column tables.
             Adjacent printing (double speed) value is also configured.
         """
-        # Get horizontal resolution via a mapping
-        self.horizontal_resolution = self.bit_image_horizontal_resolution_mapping[dot_density_m]
-
-        # Get vertical resolution & expected bytes per column (influences the number of dots per column)
-        if dot_density_m < 32:
-            # For 9 pins, fixed resolution
-            self.vertical_resolution = 1 / 72 if self.pins == 9 else 1 / 60
-            self.bytes_per_column = 1
-        elif dot_density_m < 64:
-            # Should not be available to 9 pins printers
-            self.vertical_resolution = 1 / 180
-            self.bytes_per_column = 3
-        else:
-            # Values under 73 (included)
-            # Should not be available for 9 & 24 pins printers
-            self.vertical_resolution = 1 / 360
-            self.bytes_per_column = 6
-
-        # Get speed (adjacent dot printing not enabled for the following densities)
-        self.double_speed = dot_density_m in (2, 3, 40, 72)
+        # Get the mode via a mapping built at the initialization
+        (
+            self.horizontal_resolution,
+            self.vertical_resolution,
+            self.bytes_per_column,
+            self.double_speed,
+        ) = self.bit_image_modes[dot_density_m]
 
     def reassign_bit_image_mode(self, _, cmd_letter: Token, dot_density_m: Token):
         """Assign the dot density used during the ESC K, L, Y, Z commands to the
@@ -3962,8 +4340,7 @@ class ESCParser:
         .. seealso:: :meth:`reassign_bit_image_mode`, :meth:`configure_bit_image`,
             :meth:`print_bit_image_dots`.
         """
-        nL, nH = header.value
-        expected_bytes = (nH << 8) + nL
+        (expected_bytes,) = COUNT_HEADER.unpack(header.value)
         cmd_code = cmd_code.value
         data = data.value
         if len(data) != expected_bytes:  # pragma: no cover
@@ -3972,15 +4349,8 @@ class ESCParser:
                 expected_bytes, len(data)
             )
 
-        cmd_codes_idx_mapping = {
-            b"K": 0,
-            b"L": 1,
-            b"Y": 2,
-            b"Z": 3,
-        }
-
         # Get the corresponding density (potentially modified by ESC ?)
-        dot_density_m = self.klyz_densities[cmd_codes_idx_mapping[cmd_code]]
+        dot_density_m = self.klyz_densities[KLYZ_COMMAND_INDEXES[cmd_code]]
         # Configure & print data
         self.configure_bit_image(dot_density_m)
         self.print_bit_image_dots(data)
@@ -4001,8 +4371,7 @@ class ESCParser:
 
         Todo: Graphics data that would print beyond the right-margin position is ignored.
         """
-        dot_density_m, nL, nH = args[1].value
-        expected_bytes = (nH << 8) + nL
+        dot_density_m, expected_bytes = BIT_IMAGE_HEADER.unpack(args[1].value)
 
         data = args[2].value
         if len(data) != expected_bytes:  # pragma: no cover
@@ -4079,29 +4448,18 @@ class ESCParser:
 
         PS: It's not a BASIC script & my customers may need it ><.
         """
-        barcode_types = {
-            0: "EAN13",
-            1: "EAN8",
-            2: "I2of5",  # "Interleaved 2 of 5",
-            3: "UPCA",
-            4: "UPCE",  # Not supported
-            5: "Standard39",
-            6: "Code128",
-            7: "POSTNET",
-        }
         not_supported_types = (4,)
 
         (
-            nL,
-            nH,
+            expected_bytes,
             barcode_type_k,
             module_width_m,
             space_adjustment_s,
-            v1,
-            v2,
+            bar_length,
             control_flag_c,
-        ) = header.value
-        expected_bytes = (nH << 8) + nL - 6
+        ) = BARCODE_HEADER.unpack(header.value)
+        # The header (except nL, nH) is counted
+        expected_bytes -= 6
 
         data = data.value
         if len(data) != expected_bytes:  # pragma: no cover
@@ -4111,12 +4469,12 @@ class ESCParser:
             )
 
         if barcode_type_k in not_supported_types:
-            LOGGER.error("Barcode type %s is NOT supported (yet)!", barcode_types[barcode_type_k])
+            LOGGER.error("Barcode type %s is NOT supported (yet)!", BARCODE_TYPES[barcode_type_k])
             return
 
         # PS: Bar length is ignored when POSTNET is selected
         unit = 1 / 72 if self.pins == 9 else 1 / 180
-        bar_length = ((v2 << 8) + v1) * unit
+        bar_length *= unit
         # Limit invalid data
         bar_length = min(max(bar_length, 18 / 72 if self.pins == 9 else 45 / 180), 22)
 
@@ -4134,18 +4492,16 @@ class ESCParser:
         flag_char_under = bool(3 & control_flag_c)
 
         if LOGGER.level == DEBUG:
-            LOGGER.debug("Barcode type: %s", barcode_types[barcode_type_k])
+            LOGGER.debug("Barcode type: %s", BARCODE_TYPES[barcode_type_k])
             LOGGER.debug("Barcode height: %s", bar_length)
             LOGGER.debug("Barcode humanreadable: %s", human_readable)
             LOGGER.debug("Barcode flag under: %s", flag_char_under)
             LOGGER.debug("Barcode module width: %s", module_width_m)
             LOGGER.debug("Barcode add_check_digit: %s", add_check_digit)
 
-        import reportlab.graphics.barcode as bc
-
-        color = colors.HexColor(self.RGB_colors[self.color])
-        barcode = bc.createBarcodeDrawing(
-            barcode_types[barcode_type_k],
+        color = self.RGB_colors[self.color]
+        barcode = createBarcodeDrawing(
+            BARCODE_TYPES[barcode_type_k],
             value=data.decode(),
             barHeight=bar_length * 72,
             barStrokeWidth=(module_width_m / 180) * 72,
@@ -4183,14 +4539,16 @@ class ESCParser:
         """
         if tree.data in ("start", "instruction", "tiff_compressed_rule"):
             # Recursive call
-            _ = [
+            # PS: Children are always trees; tokens that are not arguments of
+            # a command are filtered by the grammar.
+            # PS2: "?instruction" is inlined only when it has exactly one child;
+            # the filtered _TRASH alternative still produces an empty
+            # "instruction" tree.
+            for child in tree.children:
                 self.run_esc_instruction(child)
-                for child in tree.children
-                if not isinstance(child, Token)
-            ]
-        elif tree.data in self.dir:
+        elif (method := self.commands.get(tree.data)) is not None:
             # Call the method and send the tokens as arguments
-            getattr(self, tree.data)(*tree.children)
+            method(self, *tree.children)
         else:
             LOGGER.error("Command not implemented: %s; value: %s", tree, tree.data)
 
@@ -23,6 +23,7 @@ import pytest
 from lark import UnexpectedToken
 
 # Local imports
+from escapy.grammar import decompress_rle_data
 from escapy.parser import ESCParser as _ESCParser
 from .misc import typefaces
 
@@ -56,3 +57,23 @@ def test_exception_handling(not_expected_param):
 
     with pytest.raises(UnexpectedToken):
         _ = ESCParser(not_expected_param, pdf=False)
+
+
+def test_decompress_rle_data_truncated():
+    """Test RLE decompression of a stream that ends too early
+
+    A repeat counter without its data byte must not invent data.
+    A data-length counter with missing bytes yields the available bytes only.
+    """
+    # Repeat counter (3 times) without the byte to repeat
+    with pytest.raises(StopIteration):
+        decompress_rle_data(iter(b"\xfe"), 3)
+
+    # Data-length counter (3 bytes) followed by 2 bytes only
+    data, _ = decompress_rle_data(iter(b"\x02\x01\x02"), 3)
+    assert data == b"\x01\x02"
+
+    # Complete stream: repeat counter (3 times) + data-length counter (1 byte)
+    data, bytes_read = decompress_rle_data(iter(b"\xfe\x07\x00\x08"), 4)
+    assert data == b"\x07\x07\x07\x08"
+    assert bytes_read == 4
@@ -323,6 +323,32 @@ def test_select_bit_image(
     pdf_comparison(processed_file)
 
 
+@pytest.mark.parametrize(
+    "data, bytes_per_column, double_speed, extended_dots, expected",
+    [
+        # 3 adjacent dots on the top line, 1 isolated dot at the bottom
+        (b"\x80\x80\x81", 1, False, False, [[0], [0], [0, 7]]),
+        # Double-speed: only the 1st and 3rd dots of the run are kept
+        (b"\x80\x80\x81", 1, True, False, [[0], [], [0, 7]]),
+        # 9th dot is the 1st bit of the 2nd byte; the others are ignored
+        (b"\xff\xff", 2, False, True, [list(range(9))]),
+        # Partial last column is right-aligned
+        (b"\x00\x01\x01", 2, False, False, [[15], [15]]),
+    ],
+    ids=["default", "double_speed", "extended_dots", "partial_column"],
+)
+def test_unpack_bit_image_columns(
+    data, bytes_per_column, double_speed, extended_dots, expected
+):
+    """Test the extraction of the dots from bit image data"""
+    columns = _ESCParser.unpack_bit_image_columns(
+        data, bytes_per_column, double_speed, extended_dots
+    )
+
+    found = [column.nonzero()[0].tolist() for column in columns]
+    assert found == expected
+
+
 # Raster graphics ##############################################################
 
 
@@ -337,6 +363,10 @@ def test_rle_decompress():
 
     assert found == expected_decompressed_data
 
+    # Truncated data: repeat counter (3 times) without the byte to repeat
+    with pytest.raises(IndexError):
+        _ESCParser.decompress_rle_data(b"\x00\x01\xfe")
+
 
 def get_raster_data_code(rle_compressed=False):
     """Generate raster data in graphics mode according to the compression level
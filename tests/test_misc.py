@@ -83,3 +83,33 @@ def test_not_implemented_command(tmp_path: Path, caplog):
 
     print("records:", caplog.records)
     assert "Command not implemented: Tree('set_unidirectional_mode'" in caplog.text
+
+
+def test_subclass_commands_dispatch():
+    """Test that the commands of ESCParser are dispatched through a subclass
+
+    Overridden methods of the subclass must take precedence.
+    """
+
+    class SubParser(_ESCParser):
+        """Parser overriding one command"""
+
+        __slots__ = ("backspace_count",)
+
+        def __init__(self, *args, **kwargs):
+            self.backspace_count = 0
+            super().__init__(*args, **kwargs)
+
+        def backspace(self, *args):
+            """Count the BS commands instead of moving the cursor"""
+            self.backspace_count += 1
+
+    code = esc_reset + b"A\r\n\x08"
+    escapy = SubParser(code, available_fonts=typefaces, pdf=False)
+
+    assert escapy.commands.keys() == ESCParser(esc_reset, pdf=False).commands.keys()
+    assert escapy.commands["backspace"] is SubParser.backspace
+    # CR/LF are dispatched: back to the left margin, one line below
+    assert escapy.cursor_x == escapy.left_margin
+    assert escapy.cursor_y == escapy.top_margin - escapy.current_line_spacing
+    assert escapy.backspace_count == 1